@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_dataset_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='data_file',
+            field=models.FileField(blank=True, null=True, upload_to='datasets/'),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='row_index',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 
 # Create your models here.
 class DataSet(models.Model):
@@ -7,6 +9,15 @@ class DataSet(models.Model):
     filename = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     summary = models.JSONField()
+    # Persisted copy of the uploaded CSV and its sparse row-offset index,
+    # used to serve paginated rows without re-parsing the whole file.
+    data_file = models.FileField(upload_to='datasets/', null=True, blank=True)
+    row_index = models.JSONField(null=True, blank=True)
 
     def __str__(self):
-        return self.filename
\ No newline at end of file
+        return self.filename
+
+@receiver(post_delete, sender=DataSet)
+def delete_data_file(sender, instance, **kwargs):
+    if instance.data_file:
+        instance.data_file.delete(save=False)
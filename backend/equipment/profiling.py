@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Parse uploads in chunks of this many rows so only one chunk is ever held
+# at pandas' default (wide) dtypes.
+CHUNK_ROWS = 100000
+
+# String columns whose distinct values make up at most this fraction of the
+# rows are stored as categoricals.
+CATEGORY_RATIO = 0.5
+
+
+def _is_text(series):
+    # Covers both object columns (pandas 2) and the `str` dtype (pandas 3)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _kind(series):
+    if _is_text(series):
+        return 'text'
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return 'number'
+    return str(series.dtype)
+
+
+def _downcast_int(series):
+    # Like pd.to_numeric(downcast='integer') but without an int64 copy of
+    # the column, which would dominate peak memory when combining chunks.
+    if series.empty:
+        return series
+    lo, hi = series.min(), series.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            if np.dtype(dtype).itemsize < series.dtype.itemsize:
+                return series.astype(dtype)
+            break
+    return series
+
+
+def compact_column(series):
+    """Return the narrowest lossless representation of a column.
+
+    Integers are downcast. Floats stay float64 so that means and deviations
+    are computed at full precision.
+    """
+    if pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return _downcast_int(series)
+    if _is_text(series) and len(series):
+        if series.nunique(dropna=True) <= len(series) * CATEGORY_RATIO:
+            return series.astype('category')
+    return series
+
+
+def _combine(parts):
+    # pd.concat turns categoricals with differing categories back into
+    # object columns, so union them explicitly.
+    categorical = [isinstance(part.dtype, pd.CategoricalDtype) for part in parts]
+    if all(categorical):
+        return pd.Series(union_categoricals(parts), name=parts[0].name)
+    combined = pd.concat(parts, ignore_index=True)
+    if _is_text(combined) and not any(categorical):
+        # Too many distinct values in every chunk; skip counting them again
+        # over the whole column, which would need a full-size hash table.
+        return combined
+    return compact_column(combined)
+
+
+def _read_chunks(file, chunk_rows, **kwargs):
+    file.seek(0)
+    return pd.read_csv(file, chunksize=chunk_rows, **kwargs)
+
+
+def read_compact_csv(file, chunk_rows=CHUNK_ROWS):
+    """Parse a CSV chunk by chunk, compacting each chunk as it is read.
+
+    Returns the compact frame and a memory profile comparing each column at
+    pandas' default dtypes with its compacted form.
+    """
+    parts = {}
+    kinds = {}
+    before = {}
+    dtypes_before = {}
+    for chunk in _read_chunks(file, chunk_rows):
+        usage = chunk.memory_usage(index=False, deep=True)
+        for col in chunk.columns:
+            series = chunk[col]
+            kinds.setdefault(col, set()).add(_kind(series))
+            before[col] = before.get(col, 0) + int(usage[col])
+            dtypes_before.setdefault(col, str(series.dtype))
+            parts.setdefault(col, []).append(compact_column(series))
+        del chunk, usage, series
+
+    if not parts:
+        # Header-only file: profile its empty columns the same way
+        file.seek(0)
+        empty = pd.read_csv(file)
+        usage = empty.memory_usage(index=False, deep=True)
+        for col in empty.columns:
+            kinds[col] = {_kind(empty[col])}
+            before[col] = int(usage[col])
+            dtypes_before[col] = str(empty[col].dtype)
+            parts[col] = [empty[col]]
+
+    # dtypes are inferred per chunk, so a column can look numeric in one
+    # chunk and textual in another. Whole-file parsing would keep such a
+    # column as strings throughout; re-read just those columns as text.
+    mixed = [col for col in parts if 'text' in kinds[col] and len(kinds[col]) > 1]
+    if mixed:
+        for col in mixed:
+            parts[col] = []
+            before[col] = 0
+        for chunk in _read_chunks(file, chunk_rows, usecols=mixed, dtype={col: str for col in mixed}):
+            usage = chunk.memory_usage(index=False, deep=True)
+            for col in mixed:
+                before[col] += int(usage[col])
+                dtypes_before[col] = str(chunk[col].dtype)
+                parts[col].append(compact_column(chunk[col]))
+
+    # Combine one column at a time, releasing its chunks as we go, so peak
+    # memory stays close to the size of the compact frame.
+    columns = {}
+    for col in list(parts):
+        columns[col] = _combine(parts.pop(col))
+    df = pd.DataFrame(columns, copy=False)
+    del columns
+
+    after = df.memory_usage(index=False, deep=True)
+    columns = {
+        col: {
+            'dtype_before': dtypes_before[col],
+            'dtype_after': str(df[col].dtype),
+            'bytes_before': before[col],
+            'bytes_after': int(after[col]),
+        }
+        for col in df.columns
+    }
+    total_before = sum(c['bytes_before'] for c in columns.values())
+    total_after = sum(c['bytes_after'] for c in columns.values())
+    return df, {
+        'columns': columns,
+        'total_bytes_before': total_before,
+        'total_bytes_after': total_after,
+        'reduction': round(1 - total_after / total_before, 4) if total_before else 0.0,
+    }
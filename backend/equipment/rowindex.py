@@ -0,0 +1,119 @@
+import io
+import numpy as np
+import pandas as pd
+
+# Record the byte offset of every Nth data row. Serving a page then costs one
+# seek plus at most ROW_INDEX_STRIDE skipped records, whatever the offset.
+ROW_INDEX_STRIDE = 1000
+
+# Lines are read in blocks of about this many bytes. A block in which every
+# opening quote sits at the start of a field and no quoted field spans a line
+# has its lines yielded as records directly; this is the common case,
+# including exporters that quote every field. Other blocks fall back to
+# _scan_quotes line by line.
+_BLOCK_SIZE = 1 << 18
+_FIELD_START = np.frombuffer(b',\n"', dtype=np.uint8)
+
+
+def _well_quoted(block):
+    # Pairing quotes in order gives (open, close) pairs. That pairing is the
+    # real one if each opening quote follows a delimiter, a line start or the
+    # previous closing quote ('""' escape). Checked with vector ops, in C.
+    if b'"' not in block:
+        return True
+    data = np.frombuffer(block, dtype=np.uint8)
+    quotes = np.flatnonzero(data == 0x22)
+    if len(quotes) % 2:
+        return False
+    opens, closes = quotes[0::2], quotes[1::2]
+    if not np.isin(data[opens[opens > 0] - 1], _FIELD_START).all():
+        return False
+    newlines = np.flatnonzero(data == 0x0A)
+    return np.array_equal(np.searchsorted(newlines, opens), np.searchsorted(newlines, closes))
+
+
+def _scan_quotes(line, in_quotes):
+    # Follow the CSV grammar pandas uses: a quote only opens a quoted field at
+    # the start of that field, '""' inside one is an escaped quote, and any
+    # other quote (e.g. an inch mark in `Pipe,3"`) is a literal character.
+    # Returns whether the line ends inside a quoted field. Only the quote
+    # characters are visited, so the scanning itself runs in C.
+    i = line.find(b'"')
+    while i != -1:
+        if in_quotes:
+            if line[i + 1:i + 2] == b'"':
+                i = line.find(b'"', i + 2)
+                continue
+            in_quotes = False
+        elif i == 0 or line[i - 1] == 0x2C:
+            in_quotes = True
+        i = line.find(b'"', i + 1)
+    return in_quotes
+
+
+def _records(fh):
+    # Yield raw CSV records as bytes. A newline inside a quoted field does not
+    # end the record, so such lines are joined until the field is closed.
+    pending = b''
+    in_quotes = False
+    while True:
+        lines = fh.readlines(_BLOCK_SIZE)
+        if not lines:
+            break
+        if not in_quotes and _well_quoted(b''.join(lines)):
+            yield from lines
+            continue
+        for line in lines:
+            if not in_quotes and b'"' not in line:
+                yield line
+                continue
+            pending += line
+            in_quotes = _scan_quotes(line, in_quotes)
+            if not in_quotes:
+                yield pending
+                pending = b''
+    if pending:
+        yield pending
+
+
+def build_row_index(path, stride=ROW_INDEX_STRIDE):
+    """Scan a persisted CSV once and return a sparse row-offset index."""
+    offsets = []
+    rows = 0
+    with open(path, 'rb') as fh:
+        records = _records(fh)
+        header = next(records, b'')
+        position = len(header)
+        for record in records:
+            if not record.strip():
+                position += len(record)
+                continue
+            if rows % stride == 0:
+                offsets.append(position)
+            position += len(record)
+            rows += 1
+    return {'stride': stride, 'rows': rows, 'offsets': offsets}
+
+
+def read_rows(path, row_index, columns, offset, limit, usecols=None, dtype=None):
+    """Return `limit` rows starting at `offset` as a DataFrame.
+
+    Seeks to the nearest indexed row and reads forward, so only the requested
+    page (plus less than one stride of skipped rows) is ever parsed.
+    """
+    stride = row_index['stride']
+    offsets = row_index['offsets']
+    if limit <= 0 or offset >= row_index['rows'] or not offsets:
+        return pd.DataFrame(columns=usecols or columns)
+
+    with open(path, 'rb') as fh:
+        fh.seek(offsets[offset // stride])
+        records = (record for record in _records(fh) if record.strip())
+        for _ in range(offset % stride):
+            next(records, None)
+        buf = io.BytesIO()
+        for _, record in zip(range(limit), records):
+            buf.write(record)
+
+    buf.seek(0)
+    return pd.read_csv(buf, header=None, names=columns, usecols=usecols, dtype=dtype)
@@ -4,4 +4,4 @@ from .models import DataSet
 class DataSetSerializer(serializers.ModelSerializer):
     class Meta:
         model = DataSet
-        fields = '__all__'
+        exclude = ['data_file', 'row_index']
@@ -1,3 +1,241 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import DataSet
+from .profiling import compact_column, read_compact_csv
+from .rowindex import build_row_index, read_rows
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def write_csv(text):
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(text.encode())
+    return path
+
+
+def equipment_csv(rows):
+    lines = ['Equipment Name,Type,Flowrate,Pressure']
+    for i in range(rows):
+        lines.append(f'E{i},{["Pump", "Valve", "Reactor"][i % 3]},{i * 1.5},{i % 7}')
+    return '\n'.join(lines) + '\n'
+
+
+class RowIndexTests(TestCase):
+    def assertPagesMatch(self, text, stride, offsets, limit=5):
+        path = write_csv(text)
+        self.addCleanup(os.remove, path)
+        expected = pd.read_csv(path)
+        index = build_row_index(path, stride=stride)
+        self.assertEqual(index['rows'], len(expected))
+        columns = list(expected.columns)
+        for offset in offsets:
+            page = read_rows(path, index, columns, offset, limit)
+            pd.testing.assert_frame_equal(
+                page.reset_index(drop=True),
+                expected.iloc[offset:offset + limit].reset_index(drop=True),
+                check_dtype=False,
+            )
+
+    def test_offsets_around_stride_boundary(self):
+        self.assertPagesMatch(equipment_csv(50), 10, [0, 9, 10, 11, 19, 20, 45])
+
+    def test_offset_past_end_returns_empty_page(self):
+        path = write_csv(equipment_csv(20))
+        self.addCleanup(os.remove, path)
+        index = build_row_index(path, stride=10)
+        page = read_rows(path, index, ['Equipment Name', 'Type', 'Flowrate', 'Pressure'], 20, 5)
+        self.assertTrue(page.empty)
+
+    def test_quoted_fields_with_newlines(self):
+        lines = ['Name,Note,Value']
+        for i in range(30):
+            note = f'"line one\nline ""two"" {i}"' if i % 4 == 0 else f'plain {i}'
+            lines.append(f'E{i},{note},{i}')
+        self.assertPagesMatch('\n'.join(lines) + '\n', 5, [0, 4, 5, 6, 12, 28])
+
+    def test_literal_quote_in_unquoted_field(self):
+        lines = ['Name,Size,Value'] + [f'Pipe{i},{i}",{i}' for i in range(10)]
+        self.assertPagesMatch('\n'.join(lines) + '\n', 3, [0, 2, 3, 5, 9])
+
+    def test_fully_quoted_file(self):
+        lines = ['"Name","Note","Value"']
+        for i in range(40):
+            note = 'say ""hi""' if i % 5 == 0 else f'n{i}'
+            lines.append(f'"E{i}","{note}","{i}"')
+        self.assertPagesMatch('\n'.join(lines) + '\n', 7, [0, 6, 7, 8, 35])
+
+    def test_blank_lines_are_skipped(self):
+        text = 'Name,Value\nA,1\n\nB,2\n   \nC,3\nD,4\n\n'
+        self.assertPagesMatch(text, 2, [0, 1, 2, 3], limit=2)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class UploadTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, text, name='data.csv'):
+        response = self.client.post(
+            '/api/upload/',
+            {'file': SimpleUploadedFile(name, text.encode(), content_type='text/csv')},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return DataSet.objects.get(pk=response.data['id'])
+
+
+class DataSetRowsViewTests(UploadTestCase):
+    def rows(self, pk, **params):
+        return self.client.get(f'/api/history/{pk}/rows/', params)
+
+    def test_pages_across_stride_boundary(self):
+        dataset = self.upload(equipment_csv(2500))
+        self.assertEqual(dataset.row_index['rows'], dataset.summary['rows'])
+        for offset in (999, 1000, 1001):
+            response = self.rows(dataset.pk, offset=offset, limit=3)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['total'], 2500)
+            names = [row['Equipment Name'] for row in response.data['rows']]
+            self.assertEqual(names, [f'E{i}' for i in range(offset, offset + 3)])
+
+    def test_columns_filter(self):
+        dataset = self.upload(equipment_csv(10))
+        response = self.rows(dataset.pk, offset=2, limit=2, columns='Pressure,Type')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['columns'], ['Pressure', 'Type'])
+        self.assertEqual(response.data['rows'], [
+            {'Pressure': 2, 'Type': 'Reactor'},
+            {'Pressure': 3, 'Type': 'Pump'},
+        ])
+
+    def test_text_columns_keep_whole_file_type(self):
+        lines = ['ID,Value', 'A00000,0'] + [f'{i:05d},{i}' for i in range(1, 10)]
+        dataset = self.upload('\n'.join(lines) + '\n')
+        response = self.rows(dataset.pk, offset=5, limit=3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['ID'] for row in response.data['rows']], ['00005', '00006', '00007'])
+        self.assertEqual([row['Value'] for row in response.data['rows']], [5, 6, 7])
+        self.assertEqual(dataset.summary['preview'][5]['ID'], '00005')
+
+    def test_unknown_column_is_rejected(self):
+        dataset = self.upload(equipment_csv(10))
+        response = self.rows(dataset.pk, columns='Type,Bogus')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_offset_and_limit(self):
+        dataset = self.upload(equipment_csv(10))
+        for params in ({'offset': -1}, {'limit': -5}, {'offset': 'abc'}, {'limit': '1.5'}):
+            self.assertEqual(self.rows(dataset.pk, **params).status_code, 400, params)
+
+    def test_other_users_dataset_is_not_found(self):
+        dataset = self.upload(equipment_csv(10))
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user(username='bob', password='pw'))
+        response = other.get(f'/api/history/{dataset.pk}/rows/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_file_removed_on_delete(self):
+        dataset = self.upload(equipment_csv(10))
+        path = dataset.data_file.path
+        self.assertTrue(os.path.exists(path))
+        response = self.client.delete(f'/api/history/{dataset.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(os.path.exists(path))
+
+    def test_file_removed_on_history_trim(self):
+        first = self.upload(equipment_csv(10))
+        path = first.data_file.path
+        for _ in range(5):
+            self.upload(equipment_csv(10))
+        self.assertFalse(DataSet.objects.filter(pk=first.pk).exists())
+        self.assertFalse(os.path.exists(path))
+
+
+class UploadSummaryTests(UploadTestCase):
+    def test_summary_matches_uncompacted_analysis(self):
+        text = 'Type,Flowrate,Pressure\nPump,1.0,10\nPump,1.0,20\nPump,2.0,30\nValve,0.5,40\n'
+        dataset = self.upload(text)
+        baseline = pd.read_csv(io.StringIO(text))
+        summary = dataset.summary
+        self.assertEqual(summary['averages_by_equipment']['Pump']['Flowrate'], 4 / 3)
+        self.assertEqual(summary['averages'], baseline.mean(numeric_only=True).to_dict())
+        self.assertEqual(summary['stats'], baseline.describe().T.fillna(0).to_dict())
+        self.assertEqual(summary['distribution'], {'Pump': 3, 'Valve': 1})
+        self.assertEqual(summary['memory']['columns']['Type']['dtype_after'], 'category')
+
+
+class ProfilingTests(TestCase):
+    def test_integers_downcast_losslessly(self):
+        series = pd.Series([-300, 0, 12000], name='Pressure')
+        compact = compact_column(series)
+        self.assertEqual(compact.dtype, 'int16')
+        self.assertEqual(compact.tolist(), series.tolist())
+
+    def test_floats_stay_full_precision(self):
+        series = pd.Series([1.0, 1.0, 2.0], name='Flowrate')
+        self.assertEqual(compact_column(series).dtype, 'float64')
+
+    def test_low_cardinality_strings_become_categorical(self):
+        series = pd.read_csv(io.StringIO('Type\nPump\nPump\nValve\nPump\n'))['Type']
+        compact = compact_column(series)
+        self.assertIsInstance(compact.dtype, pd.CategoricalDtype)
+        self.assertEqual(compact.tolist(), series.tolist())
+
+    def test_high_cardinality_strings_are_kept(self):
+        series = pd.Series(['E1', 'E2', 'E3', 'E4'])
+        self.assertNotIsInstance(compact_column(series).dtype, pd.CategoricalDtype)
+
+    def test_categoricals_from_chunks_are_merged(self):
+        text = 'Type,Value\nPump,1\nPump,2\nValve,3\nValve,4\nReactor,5\nReactor,6\n'
+        df, _ = read_compact_csv(io.StringIO(text), chunk_rows=2)
+        self.assertIsInstance(df['Type'].dtype, pd.CategoricalDtype)
+        self.assertEqual(set(df['Type'].cat.categories), {'Pump', 'Valve', 'Reactor'})
+        self.assertEqual(df['Type'].tolist(), ['Pump', 'Pump', 'Valve', 'Valve', 'Reactor', 'Reactor'])
+
+    def test_columns_typed_differently_across_chunks_match_whole_file(self):
+        text = 'Type,Code\nPump,0\nPump,1\nPump,2\nValve,3\nValve,A7\nPump,B9\n'
+        df, _ = read_compact_csv(io.StringIO(text), chunk_rows=2)
+        baseline = pd.read_csv(io.StringIO(text))
+        self.assertEqual(df['Code'].tolist(), baseline['Code'].tolist())
+        self.assertEqual(df['Code'].value_counts().to_dict(), baseline['Code'].value_counts().to_dict())
+
+    def test_memory_profile_totals(self):
+        df, profile = read_compact_csv(io.StringIO(equipment_csv(300)), chunk_rows=100)
+        columns = profile['columns']
+        self.assertEqual(set(columns), set(df.columns))
+        self.assertEqual(profile['total_bytes_before'], sum(c['bytes_before'] for c in columns.values()))
+        self.assertEqual(profile['total_bytes_after'], sum(c['bytes_after'] for c in columns.values()))
+        self.assertEqual(profile['total_bytes_after'], int(df.memory_usage(index=False, deep=True).sum()))
+        self.assertEqual(
+            profile['reduction'],
+            round(1 - profile['total_bytes_after'] / profile['total_bytes_before'], 4),
+        )
+        self.assertGreater(profile['reduction'], 0)
+        baseline = pd.read_csv(io.StringIO(equipment_csv(300)))
+        self.assertEqual(
+            profile['total_bytes_before'],
+            int(baseline.memory_usage(index=False, deep=True).sum()),
+        )
+
+    def test_header_only_file_is_profiled(self):
+        df, profile = read_compact_csv(io.StringIO('Type,Value\n'))
+        self.assertEqual(list(df.columns), ['Type', 'Value'])
+        self.assertEqual(set(profile['columns']), {'Type', 'Value'})
+        self.assertEqual(profile['total_bytes_after'], int(df.memory_usage(index=False, deep=True).sum()))
@@ -1,6 +1,6 @@
 
 from django.urls import path
-from .views import UploadView, HistoryView, ApiRootView, DeleteDataSetView, GeneratePDFView, RegisterView, DeleteAccountView
+from .views import UploadView, HistoryView, ApiRootView, DeleteDataSetView, DataSetRowsView, GeneratePDFView, RegisterView, DeleteAccountView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -11,6 +11,7 @@ urlpatterns = [
     path('upload/', UploadView.as_view(), name='upload'),
     path('history/', HistoryView.as_view(), name='history'),
     path('history/<int:pk>/', DeleteDataSetView.as_view(), name='delete_dataset'),
+    path('history/<int:pk>/rows/', DataSetRowsView.as_view(), name='dataset_rows'),
     path('history/<int:pk>/pdf/', GeneratePDFView.as_view(), name='generate_pdf'),
     path('delete-account/', DeleteAccountView.as_view(), name='delete_account'),
     path('register/', RegisterView.as_view(), name='register'),
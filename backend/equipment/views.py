@@ -3,8 +3,11 @@ from rest_framework.response import Response
 from rest_framework import status, permissions
 from .models import DataSet
 from .serializers import DataSetSerializer
+from .rowindex import build_row_index, read_rows
+from .profiling import read_compact_csv
 import pandas as pd
 import io
+from django.db import transaction
 from django.http import HttpResponse
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
@@ -32,7 +35,9 @@ class UploadView(APIView):
             return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            df = pd.read_csv(file)
+            # Parse and compact: numerics are downcast losslessly and
+            # low-cardinality strings become categoricals
+            df, memory_profile = read_compact_csv(file)
             
             # Large Data Handling: Downsample for visualization if too large
             downsampled = df
@@ -53,7 +58,7 @@ class UploadView(APIView):
             if not df.empty:
                 first_col = df.columns[0]
                 # Group by first column and calculate mean of numeric columns
-                grouped = df.groupby(first_col)[numeric_df.columns].mean()
+                grouped = df.groupby(first_col, observed=True)[numeric_df.columns].mean()
                 averages_by_equipment = grouped.to_dict(orient='index')
 
             summary = {
@@ -62,17 +67,43 @@ class UploadView(APIView):
                 'stats': numeric_df.describe().T.fillna(0).to_dict(),
                 'averages': df.mean(numeric_only=True).to_dict(),
                 'distribution': df.iloc[:, 0].value_counts().to_dict() if not df.empty else {},
-                'preview': df.head(100).fillna('').to_dict(orient='records'),
+                'preview': df.head(100).astype(object).fillna('').to_dict(orient='records'),
                 'downsampled': downsampled.select_dtypes(include=['number']).fillna(0).to_dict(orient='list'),
                 'histograms': histograms,
-                'averages_by_equipment': averages_by_equipment
+                'averages_by_equipment': averages_by_equipment,
+                'memory': memory_profile
             }
             
-            dataset = DataSet.objects.create(
-                user=request.user,
-                filename=file.name,
-                summary=summary
-            )
+            dataset = None
+            try:
+                with transaction.atomic():
+                    dataset = DataSet.objects.create(
+                        user=request.user,
+                        filename=file.name,
+                        summary=summary
+                    )
+
+                    # Persist the raw upload and index it so rows can be paged later
+                    file.seek(0)
+                    dataset.data_file.save(f'{dataset.pk}.csv', file, save=False)
+                    row_index = build_row_index(dataset.data_file.path)
+                    if row_index['rows'] == summary['rows']:
+                        # Pages are parsed on their own, so record which columns
+                        # the whole file typed as text for read_rows to keep
+                        row_index['text_columns'] = list(df.select_dtypes(exclude=['number', 'bool']).columns)
+                        dataset.row_index = row_index
+                    else:
+                        # The index disagrees with pandas, so paging would serve
+                        # the wrong rows; keep the summary but drop row access
+                        with open('upload_debug.log', 'a') as f:
+                            f.write(f"Row index mismatch for {file.name}: {row_index['rows']} != {summary['rows']}\n")
+                        dataset.data_file.delete(save=False)
+                    dataset.save(update_fields=['data_file', 'row_index'])
+            except Exception:
+                # The row is rolled back; remove any partly written copy too
+                if dataset is not None and dataset.data_file:
+                    dataset.data_file.delete(save=False)
+                raise
 
             # History Limit: Keep only last 5 for THIS user
             ids = DataSet.objects.filter(user=request.user).order_by('-uploaded_at').values_list('id', flat=True)
@@ -108,6 +139,52 @@ class DeleteDataSetView(APIView):
                 f.write(f"Delete error for pk={pk}: {str(e)}\n")
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class DataSetRowsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_LIMIT = 1000
+
+    def get(self, request, pk):
+        try:
+            # Ensure user owns the dataset
+            dataset = DataSet.objects.get(pk=pk, user=request.user)
+        except DataSet.DoesNotExist:
+            return Response({'error': 'File not found or access denied'}, status=status.HTTP_404_NOT_FOUND)
+        if not dataset.data_file or not dataset.row_index:
+            return Response({'error': 'Row data is not available for this dataset'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            offset = int(request.query_params.get('offset', 0))
+            limit = int(request.query_params.get('limit', 100))
+        except ValueError:
+            return Response({'error': 'offset and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if offset < 0 or limit < 0:
+            return Response({'error': 'offset and limit must be non-negative'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, self.MAX_LIMIT)
+
+        all_columns = dataset.summary.get('columns', [])
+        columns = all_columns
+        requested = request.query_params.get('columns')
+        if requested:
+            columns = [c for c in requested.split(',') if c]
+            unknown = [c for c in columns if c not in all_columns]
+            if unknown:
+                return Response({'error': f"Unknown columns: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            dtype = {col: str for col in dataset.row_index.get('text_columns', [])}
+            page = read_rows(dataset.data_file.path, dataset.row_index, all_columns, offset, limit, usecols=columns, dtype=dtype)
+            return Response({
+                'offset': offset,
+                'limit': limit,
+                'total': dataset.row_index['rows'],
+                'columns': columns,
+                'rows': page[columns].fillna('').to_dict(orient='records'),
+            })
+        except Exception as e:
+            with open('rows_debug.log', 'a') as f:
+                f.write(f"Rows error for pk={pk}: {str(e)}\n")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 from django.contrib.auth.models import User
 
 class RegisterView(APIView):